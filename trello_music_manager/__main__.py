@@ -1,20 +1,14 @@
 """Main module of the program."""
+from typing import TYPE_CHECKING, Dict, Optional
 
 import sys
 
 import argparse
-import dotenv
 
-from trello_music_manager.subcommand import (
-    album_status,
-    artist_status,
-    complete_tasks,
-    delete_album,
-    delete_artist,
-    load_data,
-    reset_tasks,
-)
-from trello_music_manager.manager import MusicBoardManager, MusicBoardManagerConfigError
+# dotenv, requests and the manager built on them are imported only once they're
+# needed, so that --help and argument errors respond quickly.
+if TYPE_CHECKING:
+    from trello_music_manager.manager import MusicBoardManager
 
 
 REQUIRED_CONFIG_VARS = [
@@ -26,9 +20,18 @@ REQUIRED_CONFIG_VARS = [
     "ALBUMS_DOING_LIST",
     "ALBUMS_DONE_LIST",
 ]
+REQUIRED = frozenset(REQUIRED_CONFIG_VARS)
 
 
-if __name__ == "__main__":
+def load_config(env_file: str) -> Dict[str, Optional[str]]:
+    """Load the configuration variables from the given env file."""
+    import dotenv
+
+    return dotenv.dotenv_values(env_file)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser with all of the program's subcommands."""
     parser = argparse.ArgumentParser(
         prog="trello_music_manager",
         description="Manage Trello board of artists and albums.",
@@ -38,6 +41,11 @@ if __name__ == "__main__":
         default=".env",
         help="file which contains the required configuration variables"
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="fetch everything from Trello again instead of revalidating cached data",
+    )
 
     subparsers = parser.add_subparsers(
         title="valid subcommands",
@@ -92,12 +100,83 @@ if __name__ == "__main__":
     delete_parser.add_argument("artist", help="exact name of the artist")
     delete_parser.add_argument("album", nargs="?", help="exact name of the album")
 
+    return parser
+
+
+def run_load_data(manager: "MusicBoardManager", args: argparse.Namespace) -> int:
+    """Run the load_data subcommand and return the exit status."""
+    from trello_music_manager.subcommand import load_data
+
+    load_data(manager, args.directory, args.albums_filename)
+    return 0
+
+
+def run_status(manager: "MusicBoardManager", args: argparse.Namespace) -> int:
+    """Run the status subcommand and return the exit status."""
+    from trello_music_manager.subcommand import album_status, artist_status
+
+    if args.album:
+        report = album_status(manager, args.artist, args.album)
+    else:
+        report = artist_status(manager, args.artist)
+    return 1 if report is None else 0
+
+
+def run_complete_tasks(manager: "MusicBoardManager", args: argparse.Namespace) -> int:
+    """Run the complete_tasks subcommand and return the exit status."""
+    from trello_music_manager.subcommand import complete_tasks
+
+    report = complete_tasks(manager, args.artist, args.album, args.tasks)
+    return 1 if report is None else 0
+
+
+def run_reset_tasks(manager: "MusicBoardManager", args: argparse.Namespace) -> int:
+    """Run the reset_tasks subcommand and return the exit status."""
+    from trello_music_manager.subcommand import reset_tasks
+
+    success = reset_tasks(manager, args.artist, args.album)
+    return 0 if success else 1
+
+
+def run_delete(manager: "MusicBoardManager", args: argparse.Namespace) -> int:
+    """Run the delete subcommand and return the exit status."""
+    from trello_music_manager.subcommand import delete_album, delete_artist
+
+    if args.album:
+        success = delete_album(manager, args.artist, args.album)
+    else:
+        success = delete_artist(manager, args.artist)
+    return 0 if success else 1
+
+
+DISPATCH = {
+    "load_data": run_load_data,
+    "status": run_status,
+    "complete_tasks": run_complete_tasks,
+    "reset_tasks": run_reset_tasks,
+    "delete": run_delete,
+}
+
+
+def main():
+    """Parse the command line, configure the manager and run the subcommand."""
+    parser = build_parser()
     args = parser.parse_args()
 
-    config = dotenv.dotenv_values(args.env_file)
-    for required_variable in REQUIRED_CONFIG_VARS:
-        if not config.get(required_variable, None):
-            exit(1)
+    if args.subcommand is None:
+        parser.print_help()
+        sys.exit(1)
+
+    config = load_config(args.env_file)
+    missing = REQUIRED - {k for k, v in config.items() if v}
+    if missing:
+        print(f"Missing configuration variables: {', '.join(sorted(missing))}")
+        sys.exit(1)
+
+    from trello_music_manager.manager import (
+        MusicBoardManager,
+        MusicBoardManagerConfigError,
+    )
 
     try:
         manager = MusicBoardManager(
@@ -108,28 +187,16 @@ if __name__ == "__main__":
             config["ALBUMS_PENDING_LIST"],
             config["ALBUMS_DOING_LIST"],
             config["ALBUMS_DONE_LIST"],
+            refresh_cache=args.refresh,
         )
     except MusicBoardManagerConfigError as e:
         print(e)
+        sys.exit(1)
 
-    if args.subcommand == "load_data":
-        load_data(manager, args.directory, args.albums_filename)
-        sys.exit(0)
-    elif args.subcommand == "status":
-        if args.album:
-            report = album_status(manager, args.artist, args.album)
-        else:
-            report = artist_status(manager, args.artist)
-        sys.exit(1 if report is None else 0)
-    elif args.subcommand == "complete_tasks":
-        report = complete_tasks(manager, args.artist, args.album, args.tasks)
-        sys.exit(1 if report is None else 0)
-    elif args.subcommand == "reset_tasks":
-        success = reset_tasks(manager, args.artist, args.album)
-        sys.exit(0 if success else 1)
-    elif args.subcommand == "delete":
-        if args.album:
-            success = delete_album(manager, args.artist, args.album)
-        else:
-            success = delete_artist(manager, args.artist)
-        sys.exit(0 if success else 1)
+    with manager:
+        status = DISPATCH[args.subcommand](manager, args)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
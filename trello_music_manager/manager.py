@@ -1,8 +1,71 @@
 """Module for the Trello music board manager itself."""
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from trello_music_manager.utils import user_cache_dir
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+BATCH_MAX_URLS = 10
+
+# At most this many requests are in flight at once across all threads.
+MAX_CONCURRENT_REQUESTS = 10
+
+CHECKITEM_POS_STEP = 16384
+CARD_POS_STEP = 16384
+
+CARD_URL_PREFIXES = ("http://", "https://")
+# The batch endpoint splits its URLs on commas, so only IDs and short links that
+# can't contain one are requested through it.
+CARD_ID_PATTERN = re.compile(r"[0-9A-Za-z]+")
+
+BOARD_LISTS_URL = "https://api.trello.com/1/boards/%s/lists"
+BOARD_CARDS_URL = "https://api.trello.com/1/boards/%s/cards"
+LIST_CARDS_URL = "https://api.trello.com/1/lists/%s/cards"
+CARDS_URL = "https://api.trello.com/1/cards"
+CARD_URL = "https://api.trello.com/1/cards/%s"
+CARD_ATTACHMENTS_URL = "https://api.trello.com/1/cards/%s/attachments"
+CARD_CHECKLISTS_URL = "https://api.trello.com/1/cards/%s/checklists"
+CARD_CHECKITEM_URL = "https://api.trello.com/1/cards/%s/checkItem/%s"
+CHECKLISTS_URL = "https://api.trello.com/1/checklists"
+CHECKLIST_CHECKITEMS_URL = "https://api.trello.com/1/checklists/%s/checkItems"
+BATCH_URL = "https://api.trello.com/1/batch"
+
+BOARD_SNAPSHOT_CARD_FIELDS = "id,name,idList,shortUrl,shortLink"
+
+ARTISTS_CARDS_CACHE_TTL = 60.0
+
+# Requests that are in flight aren't counted in the rate limit headers yet, so
+# requests wait once fewer than that many are left in the window.
+RATE_LIMIT_MIN_REMAINING = MAX_CONCURRENT_REQUESTS
+# Requests rejected with 429 Too Many Requests are retried this many times, after
+# the Retry-After delay, during which every thread waits.
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_DEFAULT_RETRY_AFTER = 1.0
+
+SERVER_ERROR_RETRIES = 5
+SERVER_ERROR_STATUS_CODES = (500, 502, 503, 504)
+
+
+def parse_json(response: requests.Response) -> Any:
+    """Parse the response's JSON body straight from its raw bytes."""
+    return json_loads(response.content)
 
 
 class MusicBoardManagerConfigError(Exception):
@@ -28,7 +91,8 @@ class MusicBoardManager:
         artists_list_name: str,
         albums_pending_list_name: str,
         albums_doing_list_name: str,
-        albums_done_list_name: str
+        albums_done_list_name: str,
+        refresh_cache: bool = False,
     ):
         self.api_key = api_key
         self.token = token
@@ -37,23 +101,97 @@ class MusicBoardManager:
         self.albums_pending_list_name = albums_pending_list_name
         self.albums_doing_list_name = albums_doing_list_name
         self.albums_done_list_name = albums_done_list_name
-
-        self.headers = {
-           "Accept": "application/json",
+        self.refresh_cache = refresh_cache
+
+        # GET responses are cached on disk and revalidated on every request, so
+        # unchanged resources come back as a body-less 304 Not Modified. Batch
+        # requests aren't cached, since each combination of URLs would be stored
+        # under a key of its own and never be pruned.
+        self.session = requests_cache.CachedSession(
+            cache_name=os.path.join(user_cache_dir(), "http_cache"),
+            backend="sqlite",
+            expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+            urls_expire_after={BATCH_URL: requests_cache.DO_NOT_CACHE},
+            cache_control=True,
+            allowable_methods=("GET",),
+            ignored_parameters=("key", "token"),
+        )
+        self.session.headers["Accept"] = "application/json"
+        self.session.params = {
+            "key": self.api_key,
+            "token": self.token,
         }
+        # 429 responses are left to make_request, which blocks all threads for the
+        # Retry-After delay. POST isn't retried, since Trello may have created the
+        # resource before failing and a retry would create it again.
+        retry = Retry(
+            total=SERVER_ERROR_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=SERVER_ERROR_STATUS_CODES,
+            allowed_methods=("GET", "PUT", "DELETE"),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                max_retries=retry,
+            ),
+        )
+
+        self.requests_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        # Only single requests which don't submit work of their own go through this
+        # executor, so that its workers can never wait on each other.
+        self.leaf_requests_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_REQUESTS
+        )
+        # Album cards are created through this executor. Its tasks only wait on leaf
+        # requests, never on each other.
+        self.album_cards_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_REQUESTS
+        )
+        self.rate_limit_lock = threading.Lock()
+        self.rate_limit_remaining = None
+        self.rate_limit_max = None
+        self.rate_limit_interval = 0.0
+        self.rate_limit_reset_at = 0.0
+        self.rate_limit_blocked_until = 0.0
 
         self.albums_checklist_name = "Albums"
 
         self.album_tasks_checklist_name = "Tasks"
-        self.album_tasks = [
+        self.album_tasks = (
             "Download",
             "Add metadata",
             "Transfer to phone",
             "Listen",
-        ]
+        )
+        self.album_tasks_set = frozenset(self.album_tasks)
+
+        self.artists_cards_lock = threading.Lock()
+        self.artists_cards_cache = None
+        self.artists_cards_expire_at = 0.0
+        self.artist_cards_cache = {}
+        self.checklists_cache = {}
+        self.checkitems_cache = {}
+        self.cards_cache = {}
 
         self.lists = self.get_board_lists()
 
+    def __enter__(self) -> "MusicBoardManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the session and release its pooled connections and threads."""
+        self.album_cards_executor.shutdown()
+        self.leaf_requests_executor.shutdown()
+        self.session.close()
+
     @property
     def artists_list(self) -> Optional[Dict[str, Any]]:
         """Get Trello list which holds artists' cards."""
@@ -76,8 +214,7 @@ class MusicBoardManager:
 
     def get_board_lists(self) -> Dict[str, Dict[str, Any]]:
         """Get lists of the Trello music board."""
-        url = "https://api.trello.com/1/boards/{id}/lists"
-        response = self.make_request(url.format(id=self.board_id), "GET")
+        response = self.make_request(BOARD_LISTS_URL % self.board_id, "GET")
         status = response.status_code
         if status != 200:
             raise MusicBoardManagerConfigError(
@@ -91,18 +228,19 @@ class MusicBoardManager:
             "albums_done": None,
         }
 
-        for trello_list in json.loads(response.text):
-            if trello_list["name"] == self.artists_list_name:
-                lists["artists"] = trello_list
-
-            if trello_list["name"] == self.albums_pending_list_name:
-                lists["albums_pending"] = trello_list
-
-            if trello_list["name"] == self.albums_doing_list_name:
-                lists["albums_doing"] = trello_list
+        list_names = {
+            "artists": self.artists_list_name,
+            "albums_pending": self.albums_pending_list_name,
+            "albums_doing": self.albums_doing_list_name,
+            "albums_done": self.albums_done_list_name,
+        }
+        keys_by_list_name = {}
+        for k, name in list_names.items():
+            keys_by_list_name.setdefault(name, []).append(k)
 
-            if trello_list["name"] == self.albums_done_list_name:
-                lists["albums_done"] = trello_list
+        for trello_list in parse_json(response):
+            for k in keys_by_list_name.get(trello_list["name"], []):
+                lists[k] = trello_list
 
         for k, v in lists.items():
             if not v:
@@ -112,22 +250,43 @@ class MusicBoardManager:
 
     def get_artists_cards(self) -> List[Dict[str, Any]]:
         """Get a list of all cards in the artists' list."""
-        url = "https://api.trello.com/1/lists/{id}/cards"
-        artists_list_id = self.artists_list["id"]
-        response = self.make_request(url.format(id=artists_list_id), "GET")
+        if (
+            self.artists_cards_cache is not None
+            and time.monotonic() < self.artists_cards_expire_at
+        ):
+            return list(self.artists_cards_cache)
+
+        response = self.make_request(LIST_CARDS_URL % self.artists_list["id"], "GET")
         if response.status_code == 200:
-            return json.loads(response.text)
+            artists_cards = parse_json(response)
+            with self.artists_cards_lock:
+                self.artists_cards_cache = artists_cards
+                self.artists_cards_expire_at = (
+                    time.monotonic() + ARTISTS_CARDS_CACHE_TTL
+                )
+                self.artist_cards_cache.clear()
+            return list(artists_cards)
         else:
             return []
 
+    def get_artists_cards_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Get the artists' cards indexed by name."""
+        # If several cards share a name, the first one is indexed.
+        for card in self.get_artists_cards():
+            if "name" in card:
+                self.artist_cards_cache.setdefault(card["name"], card)
+
+        return dict(self.artist_cards_cache)
+
     def get_artist_card(self, artist: str) -> Optional[Dict[str, Any]]:
-        """Get the card of the given artist, if any"""
-        artists_cards = self.get_artists_cards()
-        artist_card = None
-        for card in artists_cards:
-            if "name" in card and card["name"] == artist:
-                artist_card = card
-        return artist_card
+        """Get the card of the given artist, if any."""
+        if (
+            artist not in self.artist_cards_cache
+            or time.monotonic() >= self.artists_cards_expire_at
+        ):
+            self.get_artists_cards_by_name()
+
+        return self.artist_cards_cache.get(artist, None)
 
     def get_artist_card_albums_checklist(
         self, artist_card_id: str
@@ -135,6 +294,35 @@ class MusicBoardManager:
         """Get the artist's albums checklist."""
         return self.get_checklist(artist_card_id, self.albums_checklist_name)
 
+    def load_board_snapshot(self) -> bool:
+        """Memoize the board's open cards and checklists with a single request."""
+        query = {
+            "fields": BOARD_SNAPSHOT_CARD_FIELDS,
+            "checklists": "all",
+        }
+        response = self.make_request(
+            BOARD_CARDS_URL % self.board_id, "GET", query_params=query
+        )
+        if response.status_code != 200:
+            return False
+
+        for card in parse_json(response):
+            checklists = card.pop("checklists", None) or []
+            self.cards_cache[card["id"]] = card
+            if "shortLink" in card:
+                self.cards_cache[card["shortLink"]] = card
+
+            for checklist in checklists:
+                checkitems = checklist.pop("checkItems", None)
+                self.checklists_cache.setdefault(
+                    (card["id"], checklist["name"]), checklist
+                )
+                if checkitems is not None:
+                    checkitems.sort(key=lambda checkitem: checkitem.get("pos", 0))
+                    self.checkitems_cache.setdefault(checklist["id"], checkitems)
+
+        return True
+
     def get_album_cards(self, artist: str) -> List[Dict[str, Any]]:
         """Get the list of album cards linked to the given artist."""
         album_cards = []
@@ -144,29 +332,61 @@ class MusicBoardManager:
             if albums_checklist:
                 albums_checkitems = self.get_checkitems(albums_checklist["id"])
                 if albums_checkitems:
+                    linked_checkitems = []
+                    album_card_ids = []
                     for checkitem in albums_checkitems:
                         name = checkitem["name"]
-                        if name.startswith("http"):
-                            album_card_id = name.split("/")[-1]
-                            album_card = self.get_card(album_card_id)
-                            if album_card:
-                                album_card["_artist_card_id"] = artist_card["id"]
-                                album_card["_checkitem_id"] = checkitem["id"]
-                                album_card["_checkitem_state"] = checkitem["state"]
-                                album_cards.append(album_card)
+                        if name.startswith(CARD_URL_PREFIXES):
+                            linked_checkitems.append(checkitem)
+                            album_card_ids.append(name.rpartition("/")[2])
+
+                    linked_album_cards = self.get_cards_batch(album_card_ids)
+                    for checkitem, album_card in zip(
+                        linked_checkitems, linked_album_cards
+                    ):
+                        if album_card:
+                            album_card["_artist_card_id"] = artist_card["id"]
+                            album_card["_checkitem_id"] = checkitem["id"]
+                            album_card["_checklist_id"] = albums_checklist["id"]
+                            album_card["_checkitem_state"] = checkitem["state"]
+                            album_cards.append(album_card)
         return album_cards
 
     def get_album_card(self, artist: str, album: str) -> Optional[Dict[str, Any]]:
         """Get the card of the given artist's album."""
         album_cards = self.get_album_cards(artist)
-        album_card = None
-        for card in album_cards:
-            if "name" in card and card["name"] == album:
-                album_card = card
-        return album_card
+        album_cards_by_name = {
+            card["name"]: card for card in album_cards if "name" in card
+        }
+        return album_cards_by_name.get(album, None)
+
+    def get_bottom_positions(
+        self, list_id: str, count: int
+    ) -> List[Union[str, float]]:
+        """Get positions for the given number of cards below the list's bottom card."""
+        if not count:
+            return []
+
+        query = {
+            "fields": "pos",
+        }
+        response = self.make_request(
+            LIST_CARDS_URL % list_id, "GET", query_params=query
+        )
+        if response.status_code != 200:
+            return ["bottom"] * count
+
+        bottom_pos = max(
+            (card["pos"] for card in parse_json(response) if "pos" in card), default=0
+        )
+        return [bottom_pos + (i + 1) * CARD_POS_STEP for i in range(count)]
 
     def create_artist_card(
-        self, artist: str, albums: List[str], pos: str = "bottom"
+        self,
+        artist: str,
+        albums: List[str],
+        pos: Union[str, float] = "bottom",
+        albums_positions: Optional[List[Union[str, float]]] = None,
     ) -> Optional[Dict[str, Any]]:
         """Create a new card for the given artist with a checklist for their albums."""
         card = self.create_card(self.artists_list["id"], artist, pos=pos)
@@ -174,6 +394,10 @@ class MusicBoardManager:
         if not card:
             return None
 
+        with self.artists_cards_lock:
+            if self.artists_cards_cache is not None:
+                self.artists_cards_cache.append(card)
+
         checklist = self.create_checklist(card["id"], self.albums_checklist_name)
 
         if not checklist:
@@ -181,9 +405,21 @@ class MusicBoardManager:
             return None
 
         if albums:
+            if albums_positions is None:
+                albums_positions = self.get_bottom_positions(
+                    self.albums_pending_list["id"], len(albums)
+                )
+
+            album_cards = self.album_cards_executor.map(
+                lambda album, album_pos: self.create_album_card(
+                    album, card["shortUrl"], pos=album_pos
+                ),
+                albums,
+                albums_positions,
+            )
+
             albums_checklist_items = []
-            for album in albums:
-                album_card = self.create_album_card(album, card["shortUrl"])
+            for album, album_card in zip(albums, album_cards):
                 if album_card and "shortUrl" in album_card:
                     albums_checklist_items.append(album_card["shortUrl"])
                 else:
@@ -194,7 +430,11 @@ class MusicBoardManager:
         return card
 
     def add_new_albums_artist_card(
-        self, artist_card_id: str, artist_card_short_url: str, albums: List[str]
+        self,
+        artist_card_id: str,
+        artist_card_short_url: str,
+        albums: List[str],
+        albums_positions: Optional[List[Union[str, float]]] = None,
     ) -> Optional[List[str]]:
         """Add the given albums that aren't already on the artist's albums checklist."""
         if not albums:
@@ -205,22 +445,37 @@ class MusicBoardManager:
         if albums_checklist:
             albums_checkitems = self.get_checkitems(albums_checklist["id"])
 
-            current_albums = []
-            for checkitem in albums_checkitems:
-                name = checkitem["name"]
-                if name.startswith("http"):
-                    card_id = name.split("/")[-1]
-                    card = self.get_card(card_id)
-                    if card:
-                        current_albums.append(card["name"])
-                else:
-                    current_albums.append(name)
+            checkitems_names = [checkitem["name"] for checkitem in albums_checkitems]
+            linked_card_ids = [
+                name.rpartition("/")[2]
+                for name in checkitems_names
+                if name.startswith(CARD_URL_PREFIXES)
+            ]
+            current_albums = {
+                name
+                for name in checkitems_names
+                if not name.startswith(CARD_URL_PREFIXES)
+            }
+            current_albums.update(
+                card["name"] for card in self.get_cards_batch(linked_card_ids) if card
+            )
 
-            new_albums = [album for album in albums if album not in current_albums]
+            new_albums_indices = [
+                i for i, album in enumerate(albums) if album not in current_albums
+            ]
+            if albums_positions is None:
+                new_albums_positions = self.get_bottom_positions(
+                    self.albums_pending_list["id"], len(new_albums_indices)
+                )
+            else:
+                new_albums_positions = [albums_positions[i] for i in new_albums_indices]
 
             new_albums_items = []
-            for album in new_albums:
-                album_card = self.create_album_card(album, artist_card_short_url)
+            for i, album_pos in zip(new_albums_indices, new_albums_positions):
+                album = albums[i]
+                album_card = self.create_album_card(
+                    album, artist_card_short_url, pos=album_pos
+                )
                 if album_card:
                     new_albums_items.append(album_card["shortUrl"])
                 else:
@@ -229,7 +484,7 @@ class MusicBoardManager:
             return self.add_items_to_checklist(albums_checklist["id"], new_albums_items)
 
     def create_album_card(
-        self, album: str, artist_card_short_url: str, pos: str = "bottom"
+        self, album: str, artist_card_short_url: str, pos: Union[str, float] = "bottom"
     ) -> Optional[Dict[str, Any]]:
         """Create a card for the given album in the pending list."""
         album_card = self.create_card(self.albums_pending_list["id"], album, pos=pos)
@@ -237,35 +492,43 @@ class MusicBoardManager:
         if not album_card:
             return None
 
-        checklist = self.create_checklist(
-            album_card["id"], self.album_tasks_checklist_name
+        attachment_future = self.leaf_requests_executor.submit(
+            self.attach_url_to_card, album_card["id"], artist_card_short_url
         )
+        tasks_added = self.add_album_tasks_checklist(album_card["id"])
+        attached = attachment_future.result()
 
-        if not checklist:
+        if not tasks_added or not attached:
             self.delete_card(album_card["id"])
             return None
 
-        added_items = self.add_items_to_checklist(checklist["id"], self.album_tasks)
+        return album_card
 
-        if len(added_items) != len(self.album_tasks):
-            self.delete_card(album_card["id"])
-            return None
+    def add_album_tasks_checklist(self, album_card_id: str) -> bool:
+        """Create the album's tasks checklist with all of the album tasks."""
+        checklist = self.create_checklist(
+            album_card_id, self.album_tasks_checklist_name
+        )
+
+        if not checklist:
+            return False
+
+        added_items = self.add_items_to_checklist(checklist["id"], self.album_tasks)
+        return len(added_items) == len(self.album_tasks)
 
-        attachments_url = "https://api.trello.com/1/cards/{id}/attachments"
+    def attach_url_to_card(self, card_id: str, url: str) -> bool:
+        """Attach the given URL to the specified card."""
         attachments_query = {
-            "url": artist_card_short_url,
+            "url": url,
         }
         attachments_response = self.make_request(
-            attachments_url.format(id=album_card["id"]),
+            CARD_ATTACHMENTS_URL % card_id,
             "POST",
             query_params=attachments_query,
+            stream=True,
         )
-
-        if attachments_response.status_code != 200:
-            self.delete_card(album_card["id"])
-            return None
-
-        return album_card
+        attachments_response.close()
+        return attachments_response.status_code == 200
 
     def get_album_card_tasks_checklist(
         self, album_card_id: str
@@ -273,6 +536,15 @@ class MusicBoardManager:
         """Get the album's tasks checklist."""
         return self.get_checklist(album_card_id, self.album_tasks_checklist_name)
 
+    def get_album_cards_tasks_checkitems(
+        self, album_card_ids: List[str]
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """Get the items of each album's tasks checklist using batch requests."""
+        tasks_checklists = self.get_checklists_batch(
+            album_card_ids, self.album_tasks_checklist_name
+        )
+        return self.get_checkitems_batch(tasks_checklists)
+
     def create_linked_album_cards(
         self, artist_card_id: str, artist_card_short_url: str
     ) -> List[Dict[str, Any]]:
@@ -281,123 +553,337 @@ class MusicBoardManager:
 
         if albums_checklist:
             albums_checkitems = self.get_checkitems(albums_checklist["id"])
+            updated_checkitems = self.link_album_checkitems(
+                [
+                    (artist_card_id, artist_card_short_url, checkitem)
+                    for checkitem in albums_checkitems
+                ]
+            )
+            return [checkitem for checkitem in updated_checkitems if checkitem]
+
+    def create_linked_album_cards_bulk(
+        self, artists_cards: List[Tuple[str, str, str]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Create linked album cards for several artists at once."""
+        albums_checklists = self.get_checklists_batch(
+            [artist_card_id for _, artist_card_id, _ in artists_cards],
+            self.albums_checklist_name,
+        )
+        albums_checkitems_lists = self.get_checkitems_batch(albums_checklists)
+
+        artists = []
+        artists_checkitems = []
+        for (artist, artist_card_id, artist_card_short_url), albums_checkitems in zip(
+            artists_cards, albums_checkitems_lists
+        ):
+            for checkitem in albums_checkitems or []:
+                artists.append(artist)
+                artists_checkitems.append(
+                    (artist_card_id, artist_card_short_url, checkitem)
+                )
+
+        linked_checkitems = {}
+        updated_checkitems = self.link_album_checkitems(artists_checkitems)
+        for artist, updated_checkitem in zip(artists, updated_checkitems):
+            if updated_checkitem:
+                linked_checkitems.setdefault(artist, []).append(updated_checkitem)
+
+        return linked_checkitems
+
+    def link_album_checkitems(
+        self, artists_checkitems: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Create linked album cards for the given artists' albums checkitems."""
+        unlinked_count = sum(
+            not checkitem["name"].startswith(CARD_URL_PREFIXES)
+            for _, _, checkitem in artists_checkitems
+        )
+        if not unlinked_count:
+            return [None] * len(artists_checkitems)
 
-            updated_checkitems = []
-            for checkitem in albums_checkitems:
-                album_name = checkitem["name"]
-                if not album_name.startswith("http"):
-                    album_card = self.create_album_card(
-                        album_name, artist_card_short_url
-                    )
-                    if album_card and "shortUrl" in album_card:
-                        updated_checkitem = self.update_checkitem(
-                            artist_card_id,
-                            checkitem["id"],
-                            name=album_card["shortUrl"],
-                            state="incomplete",
-                        )
+        # The album cards are created concurrently, so their positions are reserved
+        # to keep them in the order of the checkitems.
+        positions = iter(
+            self.get_bottom_positions(self.albums_pending_list["id"], unlinked_count)
+        )
+        artists_checkitems_positions = [
+            (
+                *artist_checkitem,
+                "bottom"
+                if artist_checkitem[2]["name"].startswith(CARD_URL_PREFIXES)
+                else next(positions),
+            )
+            for artist_checkitem in artists_checkitems
+        ]
 
-                        if updated_checkitem:
-                            updated_checkitems.append(updated_checkitem)
+        return list(
+            self.album_cards_executor.map(
+                lambda artist_checkitem: self.link_album_checkitem(*artist_checkitem),
+                artists_checkitems_positions,
+            )
+        )
+
+    def link_album_checkitem(
+        self,
+        artist_card_id: str,
+        artist_card_short_url: str,
+        checkitem: Dict[str, Any],
+        pos: Union[str, float] = "bottom",
+    ) -> Optional[Dict[str, Any]]:
+        """Create a card for the checkitem's album and link the checkitem to it."""
+        if checkitem["name"].startswith(CARD_URL_PREFIXES):
+            return None
 
-            return updated_checkitems
+        album_card = self.create_album_card(
+            checkitem["name"], artist_card_short_url, pos=pos
+        )
+        if album_card and "shortUrl" in album_card:
+            return self.update_checkitem(
+                artist_card_id,
+                checkitem["id"],
+                name=album_card["shortUrl"],
+                state="incomplete",
+            )
 
     def create_card(
-        self, list_id: str, name: str, pos: str = "bottom"
+        self, list_id: str, name: str, pos: Union[str, float] = "bottom"
     ) -> Optional[Dict[str, Any]]:
         """Create a card on the specified list."""
-        url = "https://api.trello.com/1/cards"
         query = {
             "idList": list_id,
             "name": name,
             "pos": pos,
         }
-        response = self.make_request(url, "POST", query_params=query)
+        response = self.make_request(CARDS_URL, "POST", query_params=query)
         if response.status_code == 200:
-            return json.loads(response.text)
+            return parse_json(response)
 
     def get_card(self, card_id: str) -> Optional[Dict[str, Any]]:
         """Get the card by its ID."""
-        url = "https://api.trello.com/1/cards/{id}"
-        response = self.make_request(url.format(id=card_id), "GET")
+        response = self.make_request(CARD_URL % card_id, "GET")
         if response.status_code == 200:
-            return json.loads(response.text)
+            return parse_json(response)
+
+    def get_cards_batch(self, card_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get the cards with the given IDs or short links using batch requests."""
+        missing_card_ids = [
+            card_id
+            for card_id in card_ids
+            if card_id not in self.cards_cache and CARD_ID_PATTERN.fullmatch(card_id)
+        ]
+        missing_cards = dict(
+            zip(
+                missing_card_ids,
+                self.batch_get([f"/cards/{card_id}" for card_id in missing_card_ids]),
+            )
+        )
+        return [
+            dict(self.cards_cache[card_id])
+            if card_id in self.cards_cache
+            else missing_cards.get(card_id, None)
+            for card_id in card_ids
+        ]
 
     def move_card(
         self, card_id: str, list_id: str, pos: str = "bottom"
     ) -> Optional[Dict[str, Any]]:
         """Move a card to another list."""
-        url = "https://api.trello.com/1/cards/{id}"
         query = {
             "idList": list_id,
             "pos": pos,
         }
-        response = self.make_request(url.format(id=card_id), "PUT", query_params=query)
+        response = self.make_request(CARD_URL % card_id, "PUT", query_params=query)
+        self.forget_cached_card(card_id)
 
         if response.status_code == 200:
-            return json.loads(response.text)
+            return parse_json(response)
 
     def delete_card(self, card_id: str) -> bool:
         """Delete the card with the given ID."""
-        url = "https://api.trello.com/1/cards/{id}"
-        response = self.make_request(url.format(id=card_id), "DELETE")
-        return response.status_code == 200
+        response = self.make_request(CARD_URL % card_id, "DELETE", stream=True)
+        response.close()
+        if response.status_code != 200:
+            return False
+
+        self.forget_card(card_id)
+        return True
+
+    def forget_card(self, card_id: str):
+        """Remove the card with the given ID and its checklists from memoized data."""
+        with self.artists_cards_lock:
+            if self.artists_cards_cache is not None:
+                self.artists_cards_cache = [
+                    card for card in self.artists_cards_cache if card["id"] != card_id
+                ]
+
+        for artist, card in list(self.artist_cards_cache.items()):
+            if card["id"] == card_id:
+                del self.artist_cards_cache[artist]
+
+        self.forget_cached_card(card_id)
+
+        for key, checklist in list(self.checklists_cache.items()):
+            if key[0] == card_id:
+                del self.checklists_cache[key]
+                if checklist:
+                    self.checkitems_cache.pop(checklist["id"], None)
+
+    def forget_cached_card(self, card_id: str):
+        """Remove the card with the given ID from the memoized board snapshot."""
+        for key, card in list(self.cards_cache.items()):
+            if card["id"] == card_id:
+                self.cards_cache.pop(key, None)
+
+    def forget_card_checkitems(self, card_id: str):
+        """Remove the memoized items of the card's albums and tasks checklists."""
+        for checklist_name in (
+            self.albums_checklist_name,
+            self.album_tasks_checklist_name,
+        ):
+            checklist = self.checklists_cache.get((card_id, checklist_name), None)
+            if checklist:
+                self.checkitems_cache.pop(checklist["id"], None)
 
     def create_checklist(
         self, card_id: str, name: str, pos: str = "bottom"
     ) -> Optional[Dict[str, Any]]:
         """Create a checklist on the specified card."""
-        url = "https://api.trello.com/1/checklists"
         query = {
             "idCard": card_id,
             "name": name,
             "pos": pos,
         }
-        response = self.make_request(url, "POST", query_params=query)
+        response = self.make_request(CHECKLISTS_URL, "POST", query_params=query)
         if response.status_code == 200:
-            return json.loads(response.text)
+            self.checklists_cache.pop((card_id, name), None)
+            return parse_json(response)
 
     def get_checklist(
         self, card_id: str, checklist_name: str
     ) -> Optional[Dict[str, Any]]:
         """Get a card's checklist with the specified name."""
-        checklists_url = "https://api.trello.com/1/cards/{id}/checklists"
-        response = self.make_request(checklists_url.format(id=card_id), "GET")
+        if (card_id, checklist_name) in self.checklists_cache:
+            return self.checklists_cache[(card_id, checklist_name)]
+
+        response = self.make_request(CARD_CHECKLISTS_URL % card_id, "GET")
 
         if response.status_code == 200:
-            checklists = json.loads(response.text)
+            checklists = parse_json(response)
             for checklist in checklists:
                 if "name" in checklist and checklist["name"] == checklist_name:
+                    self.checklists_cache[(card_id, checklist_name)] = checklist
                     return checklist
 
+    def get_checklists_batch(
+        self, card_ids: List[str], checklist_name: str
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Get each card's checklist with the specified name using batch requests."""
+        missing_card_ids = [
+            card_id
+            for card_id in card_ids
+            if (card_id, checklist_name) not in self.checklists_cache
+        ]
+        cards_checklists = self.batch_get(
+            [f"/cards/{card_id}/checklists" for card_id in missing_card_ids]
+        )
+
+        for card_id, checklists in zip(missing_card_ids, cards_checklists):
+            for checklist in checklists or []:
+                if "name" in checklist and checklist["name"] == checklist_name:
+                    self.checklists_cache[(card_id, checklist_name)] = checklist
+                    break
+
+        return [
+            self.checklists_cache.get((card_id, checklist_name), None)
+            for card_id in card_ids
+        ]
+
     def add_items_to_checklist(
         self, checklist_id: str, items: List[str], pos: str = "bottom"
     ) -> List[Dict[str, Any]]:
-        """Add the given items to the specified checklist"""
-        added_checkitems = []
-        url = "https://api.trello.com/1/checklists/{id}/checkItems"
-        for item in items:
-            query = {
-                "name": item,
-                "pos": pos
-            }
-            response = self.make_request(
-                url.format(id=checklist_id), "POST", query_params=query
+        """Add the given items to the specified checklist."""
+        if pos != "bottom" or len(items) < 2:
+            checkitems = [
+                self.add_item_to_checklist(checklist_id, item, pos) for item in items
+            ]
+            return [checkitem for checkitem in checkitems if checkitem]
+
+        # The rest of the items are added concurrently at explicit positions after the
+        # first one, so that they keep their order.
+        first_checkitem = self.add_item_to_checklist(checklist_id, items[0], pos)
+        if first_checkitem and "pos" in first_checkitem:
+            positions = [
+                first_checkitem["pos"] + i * CHECKITEM_POS_STEP
+                for i in range(1, len(items))
+            ]
+            other_checkitems = list(
+                self.leaf_requests_executor.map(
+                    lambda item, item_pos: self.add_item_to_checklist(
+                        checklist_id, item, item_pos
+                    ),
+                    items[1:],
+                    positions,
+                )
             )
+        else:
+            other_checkitems = [
+                self.add_item_to_checklist(checklist_id, item, pos)
+                for item in items[1:]
+            ]
 
-            if response.status_code == 200:
-                added_checkitems.append(json.loads(response.text))
-        return added_checkitems
+        checkitems = [first_checkitem] + other_checkitems
+        return [checkitem for checkitem in checkitems if checkitem]
 
-    def get_checkitems(self, checklist_id: str) -> Optional[List[Dict[str, Any]]]:
-        """Get the items of the specified checklist."""
-        checkitems_url = "https://api.trello.com/1/checklists/{id}/checkItems"
+    def add_item_to_checklist(
+        self, checklist_id: str, item: str, pos: Union[str, float] = "bottom"
+    ) -> Optional[Dict[str, Any]]:
+        """Add a single item to the specified checklist."""
+        query = {
+            "name": item,
+            "pos": pos
+        }
         response = self.make_request(
-            checkitems_url.format(id=checklist_id), "GET"
+            CHECKLIST_CHECKITEMS_URL % checklist_id, "POST", query_params=query
         )
+        self.checkitems_cache.pop(checklist_id, None)
 
         if response.status_code == 200:
-            return json.loads(response.text)
+            return parse_json(response)
+
+    def get_checkitems(self, checklist_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the items of the specified checklist."""
+        if checklist_id in self.checkitems_cache:
+            return list(self.checkitems_cache[checklist_id])
+
+        response = self.make_request(CHECKLIST_CHECKITEMS_URL % checklist_id, "GET")
+
+        if response.status_code == 200:
+            checkitems = parse_json(response)
+            self.checkitems_cache[checklist_id] = checkitems
+            return list(checkitems)
+
+    def get_checkitems_batch(
+        self, checklists: List[Optional[Dict[str, Any]]]
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """Get the items of each of the given checklists using batch requests."""
+        missing_ids = [
+            checklist["id"]
+            for checklist in checklists
+            if checklist and checklist["id"] not in self.checkitems_cache
+        ]
+        checkitems_lists = self.batch_get(
+            [f"/checklists/{id}/checkItems" for id in missing_ids]
+        )
+        for checklist_id, checkitems in zip(missing_ids, checkitems_lists):
+            if checkitems is not None:
+                self.checkitems_cache[checklist_id] = checkitems
+
+        return [
+            list(self.checkitems_cache[checklist["id"]])
+            if checklist and checklist["id"] in self.checkitems_cache
+            else None
+            for checklist in checklists
+        ]
 
     def update_checkitem(
         self,
@@ -410,8 +896,6 @@ class MusicBoardManager:
         if not name and not state:
             return None
 
-        url = "https://api.trello.com/1/cards/{id}/checkItem/{idCheckItem}"
-
         query = {}
         if name:
             query["name"] = name
@@ -419,30 +903,165 @@ class MusicBoardManager:
             query["state"] = state
 
         response = self.make_request(
-            url.format(id=card_id, idCheckItem=checkitem_id), "PUT", query_params=query,
+            CARD_CHECKITEM_URL % (card_id, checkitem_id), "PUT", query_params=query,
         )
 
         if response.status_code == 200:
-            return json.loads(response.text)
+            checkitem = parse_json(response)
+            self.checkitems_cache.pop(checkitem.get("idChecklist", None), None)
+            return checkitem
+
+        self.forget_card_checkitems(card_id)
+
+    def update_checkitems_state(
+        self, card_id: str, checkitem_ids: List[str], state: str
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Set the state of several of the card's checkitems concurrently."""
+        if len(checkitem_ids) < 2:
+            return [
+                self.update_checkitem(card_id, checkitem_id, state=state)
+                for checkitem_id in checkitem_ids
+            ]
+
+        return list(
+            self.leaf_requests_executor.map(
+                lambda checkitem_id: self.update_checkitem(
+                    card_id, checkitem_id, state=state
+                ),
+                checkitem_ids,
+            )
+        )
 
-    def delete_checkitem(self, card_id: str, checkitem_id: str,) -> bool:
-        """Update a checkitem's name and/or state."""
-        url = "https://api.trello.com/1/cards/{id}/checkItem/{idCheckItem}"
+    def delete_checkitem(
+        self, card_id: str, checkitem_id: str, checklist_id: Optional[str] = None
+    ) -> bool:
+        """Delete a checkitem from the specified card."""
         response = self.make_request(
-            url.format(id=card_id, idCheckItem=checkitem_id), "DELETE"
+            CARD_CHECKITEM_URL % (card_id, checkitem_id), "DELETE", stream=True
         )
+        response.close()
+        if checklist_id:
+            self.checkitems_cache.pop(checklist_id, None)
+        else:
+            self.forget_card_checkitems(card_id)
         return response.status_code == 200
 
+    def batch_get(self, urls: List[str]) -> List[Optional[Any]]:
+        """Make the given GET requests through the batch endpoint."""
+        urls_groups = [
+            urls[i:i + BATCH_MAX_URLS] for i in range(0, len(urls), BATCH_MAX_URLS)
+        ]
+        if len(urls_groups) > 1:
+            groups_results = list(
+                self.leaf_requests_executor.map(self.batch_get_group, urls_groups)
+            )
+        else:
+            groups_results = [self.batch_get_group(group) for group in urls_groups]
+
+        return [result for group_results in groups_results for result in group_results]
+
+    def batch_get_group(self, urls: List[str]) -> List[Optional[Any]]:
+        """Make a single batch request for at most ten of the given GET requests."""
+        query = {
+            "urls": ",".join(urls),
+        }
+        response = self.make_request(BATCH_URL, "GET", query_params=query)
+
+        if response.status_code == 200:
+            results = parse_json(response)
+            if len(results) == len(urls):
+                return [result.get("200", None) for result in results]
+
+        return [None] * len(urls)
+
     def make_request(
-        self, url: str, method: str, query_params: Optional[Dict[str, Any]] = None
-    ) -> str:
+        self,
+        url: str,
+        method: str,
+        query_params: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
         """Make a JSON API request with the given parameters."""
-        params = {
-            "key": self.api_key,
-            "token": self.token,
-        }
-        if query_params:
-            for k, v in query_params.items():
-                params[k] = v
+        for _ in range(RATE_LIMIT_MAX_RETRIES + 1):
+            self.wait_for_rate_limit()
+            with self.requests_semaphore:
+                response = self.session.request(
+                    method,
+                    url,
+                    params=query_params,
+                    stream=stream,
+                    force_refresh=self.refresh_cache,
+                )
+            self.update_rate_limit(response)
+
+            if response.status_code != 429:
+                break
+
+            response.close()
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                retry_after = RATE_LIMIT_DEFAULT_RETRY_AFTER
+            self.block_rate_limit(retry_after)
+
+        return response
+
+    def wait_for_rate_limit(self):
+        """Take a request from the rate limit, waiting if it is nearly exhausted."""
+        while True:
+            with self.rate_limit_lock:
+                now = time.monotonic()
+                if now >= self.rate_limit_blocked_until:
+                    remaining = self.rate_limit_remaining
+                    if remaining is None or remaining > RATE_LIMIT_MIN_REMAINING:
+                        if remaining is not None:
+                            self.rate_limit_remaining = remaining - 1
+                        return
+
+                    # Without a known maximum, a single request is let through to
+                    # report the limit again.
+                    if now >= self.rate_limit_reset_at:
+                        self.rate_limit_remaining = max(
+                            self.rate_limit_max or 0, RATE_LIMIT_MIN_REMAINING + 1
+                        )
+                        self.rate_limit_reset_at = now + self.rate_limit_interval
+                        continue
 
-        return requests.request(method, url, headers=self.headers, params=params)
+                    self.rate_limit_blocked_until = self.rate_limit_reset_at
+
+                delay = self.rate_limit_blocked_until - now
+
+            time.sleep(delay)
+
+    def block_rate_limit(self, delay: float):
+        """Make all threads wait for the given delay before their next request."""
+        with self.rate_limit_lock:
+            blocked_until = time.monotonic() + delay
+            self.rate_limit_blocked_until = max(
+                self.rate_limit_blocked_until, blocked_until
+            )
+            self.rate_limit_reset_at = max(self.rate_limit_reset_at, blocked_until)
+            self.rate_limit_remaining = 0
+
+    def update_rate_limit(self, response: requests.Response):
+        """Update the rate limit state from the response's Trello headers."""
+        if getattr(response, "from_cache", False):
+            return
+
+        try:
+            remaining = int(response.headers["X-Rate-Limit-Api-Token-Remaining"])
+            interval_ms = int(response.headers["X-Rate-Limit-Api-Token-Interval-Ms"])
+        except (KeyError, ValueError):
+            return
+
+        try:
+            maximum = int(response.headers["X-Rate-Limit-Api-Token-Max"])
+        except (KeyError, ValueError):
+            maximum = None
+
+        with self.rate_limit_lock:
+            self.rate_limit_remaining = remaining
+            if maximum:
+                self.rate_limit_max = maximum
+            self.rate_limit_interval = interval_ms / 1000
+            self.rate_limit_reset_at = time.monotonic() + self.rate_limit_interval
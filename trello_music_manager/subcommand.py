@@ -1,60 +1,109 @@
 """Subcommand functions."""
 
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 from trello_music_manager.manager import MusicBoardManager
-from trello_music_manager.utils import cd, read_file_lines_stripped
+from trello_music_manager.utils import read_file_lines_stripped
+
+
+LOAD_DATA_MAX_WORKERS = 8
+READ_ALBUMS_MAX_WORKERS = 32
+
+TASK_STATUS_CODES = {None: "?", True: "1", False: "0"}
+TASK_MARKS_TABLE = str.maketrans({"?": "? ", "1": "\u2713 ", "0": "_ "})
+COMPLETE_MARKS = {True: "\u2713", False: " "}
 
 
 def load_data(
     manager: MusicBoardManager, directory: str, albums_filename: str
 ) -> Dict[str, Any]:
     """Load artists and albums from the given directory and report results."""
-    with cd(directory):
-        artists = [f.name for f in os.scandir(directory) if f.is_dir()]
-        artists.sort()
+    with os.scandir(os.path.expanduser(directory)) as entries:
+        artists_dirs = {entry.name: entry.path for entry in entries if entry.is_dir()}
+    artists = sorted(artists_dirs)
+
+    with ThreadPoolExecutor(max_workers=READ_ALBUMS_MAX_WORKERS) as executor:
+        albums_lists = executor.map(
+            read_file_lines_stripped,
+            [os.path.join(artists_dirs[artist], albums_filename) for artist in artists],
+        )
+
+        artists_cards = manager.get_artists_cards_by_name()
+        manager.get_checklists_batch(
+            [
+                artists_cards[artist]["id"]
+                for artist in artists
+                if artist in artists_cards
+            ],
+            manager.albums_checklist_name,
+        )
 
-        artists_albums = {}
-        for artist in artists:
-            with cd(artist):
-                albums = read_file_lines_stripped(albums_filename)
-                artists_albums[artist] = albums
+        artists_albums = dict(zip(artists, albums_lists))
 
-        artists_cards = {card["name"]: card for card in manager.get_artists_cards()}
+    new_artists_cards = {}
+    new_artists_albums_checkitems = {}
 
-        new_artists_cards = {}
-        new_artists_albums_checkitems = {}
+    # Positions are reserved up front so that the cards keep the artists' order
+    # even though they're created concurrently.
+    artists_positions = iter(
+        manager.get_bottom_positions(
+            manager.artists_list["id"],
+            sum(artist not in artists_cards for artist in artists),
+        )
+    )
+    albums_positions = iter(
+        manager.get_bottom_positions(
+            manager.albums_pending_list["id"],
+            sum(len(albums) for albums in artists_albums.values()),
+        )
+    )
 
+    with ThreadPoolExecutor(max_workers=LOAD_DATA_MAX_WORKERS) as executor:
+        futures = {}
         for artist, albums in artists_albums.items():
+            artist_albums_positions = list(islice(albums_positions, len(albums)))
             if artist not in artists_cards:
-                card = manager.create_artist_card(artist, albums)
-                if card:
-                    new_artists_cards[artist] = card
+                futures[artist] = executor.submit(
+                    manager.create_artist_card,
+                    artist,
+                    albums,
+                    next(artists_positions),
+                    artist_albums_positions,
+                )
             else:
                 artist_card = artists_cards[artist]
-                new_albums_checkitems = manager.add_new_albums_artist_card(
-                    artist_card["id"], artist_card["shortUrl"], albums
+                futures[artist] = executor.submit(
+                    manager.add_new_albums_artist_card,
+                    artist_card["id"],
+                    artist_card["shortUrl"],
+                    albums,
+                    artist_albums_positions,
                 )
-                if new_albums_checkitems:
-                    new_artists_albums_checkitems[artist] = new_albums_checkitems
-
-        linked_albums_checkitems = {}
-        for artist in artists:
-            if artist in new_artists_cards:
-                card = new_artists_cards[artist]
-            elif artist in artists_cards:
-                card = artists_cards[artist]
-            else:
-                continue
 
-            new_linked_checkitems = manager.create_linked_album_cards(
-                card["id"], card["shortUrl"]
-            )
-            if new_linked_checkitems:
-                linked_albums_checkitems[artist] = new_linked_checkitems
+    for artist, future in futures.items():
+        if artist not in artists_cards:
+            card = future.result()
+            if card:
+                new_artists_cards[artist] = card
+        else:
+            new_albums_checkitems = future.result()
+            if new_albums_checkitems:
+                new_artists_albums_checkitems[artist] = new_albums_checkitems
+
+    all_artists_cards = {**artists_cards, **new_artists_cards}
+    cards_to_link = []
+    for artist in artists:
+        card = all_artists_cards.get(artist, None)
+        if card:
+            cards_to_link.append((artist, card["id"], card["shortUrl"]))
+
+    linked_albums_checkitems = manager.create_linked_album_cards_bulk(cards_to_link)
 
     print("Load data: Summary ::..")
     print(f"Total artists in directory: {len(artists_albums)}")
@@ -93,28 +142,29 @@ def artist_status(manager: MusicBoardManager, artist: str) -> Optional[Dict[str,
 
     print(f"{artist} ::..")
 
+    manager.load_board_snapshot()
     album_cards = manager.get_album_cards(artist)
 
     if not album_cards:
         print("No albums found for the given artist.")
         return None
 
-    for album_card in album_cards:
+    albums_tasks_checkitems = manager.get_album_cards_tasks_checkitems(
+        [album_card["id"] for album_card in album_cards]
+    )
+
+    unknown_tasks_status = dict.fromkeys(manager.album_tasks)
+    for album_card, tasks_checkitems in zip(album_cards, albums_tasks_checkitems):
         album = album_card["name"]
         complete = album_card["_checkitem_state"] == "complete"
-        tasks_status = {task: None for task in manager.album_tasks}
+        tasks_status = unknown_tasks_status.copy()
 
-        tasks_checklist = manager.get_album_card_tasks_checklist(album_card["id"])
-        if not tasks_checklist:
-            continue
-
-        tasks_checkitems = manager.get_checkitems(tasks_checklist["id"])
         if not tasks_checkitems:
             continue
 
         for task_checkitem in tasks_checkitems:
             task = task_checkitem["name"]
-            if task in tasks_status:
+            if task in manager.album_tasks_set:
                 tasks_status[task] = task_checkitem["state"] == "complete"
 
         report["albums"][album] = {
@@ -122,15 +172,12 @@ def artist_status(manager: MusicBoardManager, artist: str) -> Optional[Dict[str,
             "tasks": tasks_status
         }
 
-        print("[", "\u2713" if complete else " ", "]", sep="", end="  |  ")
-        for task, task_complete in tasks_status.items():
-            if task_complete is None:
-                complete_mark = "?"
-            else:
-                complete_mark = "\u2713" if task_complete else "_"
-            print(complete_mark, sep="", end=" ")
-        print(end=" |  ")
-        print(album)
+        album_mark = COMPLETE_MARKS[complete]
+        tasks_codes = "".join(
+            [TASK_STATUS_CODES[status] for status in tasks_status.values()]
+        )
+        tasks_marks = tasks_codes.translate(TASK_MARKS_TABLE)
+        sys.stdout.write(f"[{album_mark}]  |  {tasks_marks} |  {album}\n")
 
     print()
     print(
@@ -146,6 +193,7 @@ def album_status(
     manager: MusicBoardManager, artist: str, album: str
 ) -> Optional[Dict[str, Any]]:
     """Show the status of an artist's album."""
+    manager.load_board_snapshot()
     album_card = manager.get_album_card(artist, album)
 
     if not album_card:
@@ -180,10 +228,10 @@ def album_status(
     for task_checkitem in tasks_checkitems:
         task = task_checkitem["name"]
         complete = task_checkitem["state"] == "complete"
-        if task in manager.album_tasks:
+        if task in manager.album_tasks_set:
             report["tasks"][task] = complete
-            print("[", "\u2713" if complete else " ", "]", sep="", end=" ")
-            print(task)
+            complete_mark = COMPLETE_MARKS[complete]
+            sys.stdout.write(f"[{complete_mark}] {task}\n")
     print()
 
     return report
@@ -197,18 +245,20 @@ def complete_tasks(
         return complete_tasks(manager, artist, album, manager.album_tasks)
 
     for task in tasks:
-        if task not in manager.album_tasks:
+        if task not in manager.album_tasks_set:
             print(f"Invalid task: {task}")
             return None
+    tasks_set = frozenset(tasks)
 
     album_card = manager.get_album_card(artist, album)
     if not album_card:
         print("Album card not found.")
         return None
+    album_card_id = album_card["id"]
 
     print(f"{artist} \u2013 {album} ::..")
 
-    tasks_checklist = manager.get_album_card_tasks_checklist(album_card["id"])
+    tasks_checklist = manager.get_album_card_tasks_checklist(album_card_id)
     if not tasks_checklist:
         print("Tasks checklist not found.")
         return None
@@ -218,20 +268,30 @@ def complete_tasks(
         print("No tasks found.")
         return None
 
-    tasks_completed = {task: False for task in manager.album_tasks}
+    pending_checkitems = [
+        task_checkitem
+        for task_checkitem in tasks_checkitems
+        if task_checkitem["name"] in tasks_set
+        and task_checkitem["state"] != "complete"
+    ]
+    updated_checkitems = manager.update_checkitems_state(
+        album_card_id,
+        [task_checkitem["id"] for task_checkitem in pending_checkitems],
+        "complete",
+    )
+    for task_checkitem, updated_checkitem in zip(
+        pending_checkitems, updated_checkitems
+    ):
+        if not updated_checkitem:
+            print(f"Could not mark task as complete: {task_checkitem['name']}")
+            return None
+
+    tasks_completed = dict.fromkeys(manager.album_tasks, False)
     for task_checkitem in tasks_checkitems:
         task = task_checkitem["name"]
-        complete = task_checkitem["state"] == "complete"
-        if task in tasks and not complete:
-            updated_checkitem = manager.update_checkitem(
-                album_card["id"], task_checkitem["id"], state="complete"
-            )
-            if not updated_checkitem:
-                print(f"Could not mark task as complete: {task}")
-                return None
-            tasks_completed[task] = True
-        else:
-            tasks_completed[task] = complete
+        tasks_completed[task] = (
+            task in tasks_set or task_checkitem["state"] == "complete"
+        )
 
     report = {
         "artist": artist,
@@ -241,48 +301,30 @@ def complete_tasks(
     }
 
     if all(tasks_completed.values()):
-        if album_card["idList"] != manager.albums_done_list["id"]:
-            moved_card = manager.move_card(
-                album_card["id"], manager.albums_done_list["id"], pos="top"
-            )
-            if not moved_card:
-                print(
-                    f"Could not move album card to '{manager.albums_done_list_name}'."
-                )
-        if album_card["_checkitem_state"] != "complete":
-            updated_checkitem = manager.update_checkitem(
-                album_card["_artist_card_id"],
-                album_card["_checkitem_id"],
-                state="complete",
-            )
-            if not updated_checkitem:
-                print("Could not mark album as complete in artist card.")
+        moved_card, updated_checkitem = move_album_card(
+            manager, album_card, manager.albums_done_list, "complete"
+        )
+        if not moved_card:
+            print(f"Could not move album card to '{manager.albums_done_list_name}'.")
+        if not updated_checkitem:
+            print("Could not mark album as complete in artist card.")
 
         report["completed"] = True
 
         print("\u2713 All tasks completed.")
     elif any(tasks_completed.values()):
-        if album_card["idList"] != manager.albums_doing_list["id"]:
-            moved_card = manager.move_card(
-                album_card["id"], manager.albums_doing_list["id"], pos="top"
-            )
-            if not moved_card:
-                print(
-                    f"Could not move album card to '{manager.albums_doing_list_name}'."
-                )
-        if album_card["_checkitem_state"] != "incomplete":
-            updated_checkitem = manager.update_checkitem(
-                album_card["_artist_card_id"],
-                album_card["_checkitem_id"],
-                state="incomplete",
-            )
-            if not updated_checkitem:
-                print("Could not mark album as incomplete in artist card.")
+        moved_card, updated_checkitem = move_album_card(
+            manager, album_card, manager.albums_doing_list, "incomplete"
+        )
+        if not moved_card:
+            print(f"Could not move album card to '{manager.albums_doing_list_name}'.")
+        if not updated_checkitem:
+            print("Could not mark album as incomplete in artist card.")
 
         report["completed"] = False
         for task, completed in tasks_completed.items():
-            print("[", "\u2713" if completed else " ", "]", sep="", end=" ")
-            print(task)
+            complete_mark = COMPLETE_MARKS[completed]
+            sys.stdout.write(f"[{complete_mark}] {task}\n")
 
     print()
 
@@ -295,10 +337,11 @@ def reset_tasks(manager: MusicBoardManager, artist: str, album: str) -> bool:
     if not album_card:
         print("Album card not found.")
         return False
+    album_card_id = album_card["id"]
 
     print(f"{artist} \u2013 {album} ::..")
 
-    tasks_checklist = manager.get_album_card_tasks_checklist(album_card["id"])
+    tasks_checklist = manager.get_album_card_tasks_checklist(album_card_id)
     if not tasks_checklist:
         print("Tasks checklist not found.")
         return False
@@ -308,39 +351,74 @@ def reset_tasks(manager: MusicBoardManager, artist: str, album: str) -> bool:
         print("No tasks found.")
         return False
 
-    for task_checkitem in tasks_checkitems:
-        task = task_checkitem["name"]
-        complete = task_checkitem["state"] == "complete"
-        if task in manager.album_tasks and complete:
-            updated_checkitem = manager.update_checkitem(
-                album_card["id"], task_checkitem["id"], state="incomplete"
-            )
-            if not updated_checkitem:
-                print(f"Could not mark task as incomplete: {task}")
-                return False
-
-    if album_card["idList"] != manager.albums_pending_list["id"]:
-        moved_card = manager.move_card(
-            album_card["id"], manager.albums_pending_list["id"], pos="top"
-        )
-        if not moved_card:
-            print(f"Could not move album card to '{manager.albums_pending_list_name}'.")
-            return False
-    if album_card["_checkitem_state"] != "incomplete":
-        updated_checkitem = manager.update_checkitem(
-            album_card["_artist_card_id"],
-            album_card["_checkitem_id"],
-            state="incomplete",
-        )
+    complete_checkitems = [
+        task_checkitem
+        for task_checkitem in tasks_checkitems
+        if task_checkitem["name"] in manager.album_tasks_set
+        and task_checkitem["state"] == "complete"
+    ]
+    updated_checkitems = manager.update_checkitems_state(
+        album_card_id,
+        [task_checkitem["id"] for task_checkitem in complete_checkitems],
+        "incomplete",
+    )
+    for task_checkitem, updated_checkitem in zip(
+        complete_checkitems, updated_checkitems
+    ):
         if not updated_checkitem:
-            print("Could not mark album as incomplete in artist card.")
+            print(f"Could not mark task as incomplete: {task_checkitem['name']}")
             return False
 
+    moved_card, updated_checkitem = move_album_card(
+        manager, album_card, manager.albums_pending_list, "incomplete"
+    )
+    if not moved_card:
+        print(f"Could not move album card to '{manager.albums_pending_list_name}'.")
+        return False
+    if not updated_checkitem:
+        print("Could not mark album as incomplete in artist card.")
+        return False
+
     print("\u2713 Successfully reset album tasks.")
     print()
     return True
 
 
+def move_album_card(
+    manager: MusicBoardManager,
+    album_card: Dict[str, Any],
+    album_list: Dict[str, Any],
+    state: str,
+) -> Tuple[bool, bool]:
+    """Move the album card to the given list and set its state in the artist card."""
+    album_list_id = album_list["id"]
+    move_card = album_card["idList"] != album_list_id
+    update_checkitem = album_card["_checkitem_state"] != state
+    if not move_card and not update_checkitem:
+        return True, True
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        moved_card_future = None
+        if move_card:
+            moved_card_future = executor.submit(
+                manager.move_card, album_card["id"], album_list_id, pos="top"
+            )
+        updated_checkitem_future = None
+        if update_checkitem:
+            updated_checkitem_future = executor.submit(
+                manager.update_checkitem,
+                album_card["_artist_card_id"],
+                album_card["_checkitem_id"],
+                state=state,
+            )
+
+    moved_card = not moved_card_future or bool(moved_card_future.result())
+    updated_checkitem = (
+        not updated_checkitem_future or bool(updated_checkitem_future.result())
+    )
+    return moved_card, updated_checkitem
+
+
 def delete_album(manager: MusicBoardManager, artist: str, album: str) -> bool:
     """Delete the specified album."""
     album_card = manager.get_album_card(artist, album)
@@ -356,7 +434,9 @@ def delete_album(manager: MusicBoardManager, artist: str, album: str) -> bool:
         return False
 
     deleted_album_checkitem = manager.delete_checkitem(
-        album_card["_artist_card_id"], album_card["_checkitem_id"]
+        album_card["_artist_card_id"],
+        album_card["_checkitem_id"],
+        album_card["_checklist_id"],
     )
     if not deleted_album_checkitem:
         print("Could not delete album from artist card.")
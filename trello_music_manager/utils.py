@@ -2,25 +2,16 @@
 from typing import List
 
 import os
-from contextlib import contextmanager
 
 
-@contextmanager
-def cd(new_dir: str):
-    """Context manager for changing the current working directory"""
+def user_cache_dir() -> str:
+    """Get the directory where the program's cache files are stored."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "trello_music_manager")
 
-    prev_dir = os.getcwd()
-    os.chdir(os.path.expanduser(new_dir))
-    try:
-        yield
-    finally:
-        os.chdir(prev_dir)
 
-
-def read_file_lines_stripped(filename: str) -> List[str]:
-    """Extract the specified file's lines into a list after stripping them."""
-    stripped_lines = []
-    with open(filename) as f:
-        for line in f:
-            stripped_lines.append(line.strip())
-    return stripped_lines
+def read_file_lines_stripped(path: str) -> List[str]:
+    """Extract the file's non-blank lines into a list after stripping them."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    return [line.strip() for line in lines if line and not line.isspace()]